@@ -2,37 +2,67 @@
 from __future__ import print_function
 import argparse
 import csv
+import io
+import sys
 
 BITORDER_LSB_FIRST = 'lsb'
 BITORDER_MSB_FIRST = 'msb'
 
-def map_value(x, low, high):
-    if x >= high: return True
-    if x < low:   return False
-    return None
-
-def bits_to_int(bits, order):
-    r = 0
-    for n,b in enumerate(bits):
-        if order == BITORDER_LSB_FIRST:
-            pass
-        elif order == BITORDER_MSB_FIRST:
-            n = len(bits) - 1 - n
-        else:
-            raise Exception("Invalid bitorder")
-
-        if b is None:
-            return None
-        assert isinstance(b, bool)
-        r |= (b << n)
-    return r
-
+INPUT_BUFSIZE = 1 << 20
+OUTPUT_BUFSIZE = 1 << 20
+
+def bit_masks(num_bits, order):
+    """Return the bit mask for each column, given the bit order"""
+    if order == BITORDER_LSB_FIRST:
+        shifts = range(num_bits)
+    elif order == BITORDER_MSB_FIRST:
+        shifts = range(num_bits - 1, -1, -1)
+    else:
+        raise Exception("Invalid bitorder")
+    return [1 << n for n in shifts]
+
+# Generate a record_to_int(values) with the loop over masks unrolled
+def make_record_to_int(masks, low, high):
+    lines = ['def record_to_int(values, low=low, high=high):', '    r = 0']
+    for n,m in enumerate(masks):
+        lines += [
+            '    x = values[{}]'.format(n),
+            '    if x >= high: r |= {}'.format(m),
+            '    elif not x < low: return None',
+        ]
+    lines.append('    return r')
+
+    ns = dict(low=low, high=high)
+    code = compile('\n'.join(lines), '<record_to_int>', 'exec')
+    exec(code, ns)
+    return ns['record_to_int']
+
+def reopen_std(stream, mode, buffering, **kwargs):
+    # Reopen a standard stream's fd with our buffer size, keeping its
+    # encoding. Streams with no real fd (e.g. StringIO) are used as-is.
+    try:
+        fd = stream.fileno()
+    except (AttributeError, io.UnsupportedOperation):
+        return stream
+    return io.open(fd, mode, buffering=buffering, encoding=stream.encoding,
+            errors=stream.errors, closefd=False, **kwargs)
+
+def open_input(path):
+    if path == '-':
+        return reopen_std(sys.stdin, 'r', INPUT_BUFSIZE, newline='')
+    return io.open(path, 'r', buffering=INPUT_BUFSIZE, newline='')
+
+def open_output():
+    # Bypass sys.stdout's (possibly line-buffered) wrapper
+    sys.stdout.flush()
+    return reopen_std(sys.stdout, 'w', OUTPUT_BUFSIZE)
 
 def parse_args():
     ap = argparse.ArgumentParser(
             formatter_class = argparse.ArgumentDefaultsHelpFormatter,
             )
-    ap.add_argument('input', type=argparse.FileType('r'))
+    ap.add_argument('input',
+        help='Input CSV file ("-" for stdin)')
 
     ap.add_argument('--low', type=float, default=0.2,
         help='Logic low threshold; values below this voltage considered logic "0"')
@@ -48,6 +78,11 @@ def parse_args():
     if args.low >= args.high:
         ap.error("--low ({}) cannot be >= --high ({})".format(args.low, args.high))
 
+    try:
+        args.input = open_input(args.input)
+    except (IOError, OSError) as e:
+        ap.error("can't open '{}': {}".format(args.input, e))
+
     return args
 
 def main():
@@ -58,15 +93,34 @@ def main():
     header = next(r)
     #print("Header:", header)
 
-    for record in r:
-        record = [float(x) for x in record]
-        #print("  input", record)
-
-        result = [map_value(x, args.low, args.high) for x in record]
-
-        val = bits_to_int(result, args.order)
-        #print("  result {}  =>  {}".format(result, val))
-        print(val)
+    # Bit positions depend on each record's width (e.g. for MSB-first),
+    # so build and cache one decoder per width seen.
+    decoders = {}
+
+    out = open_output()
+    write = out.write
+    try:
+        for record in r:
+            # Ignore empty cells at the end of a row, e.g. from trailing commas
+            while record and not record[-1]:
+                record.pop()
+            record = list(map(float, record))
+            #print("  input", record)
+
+            width = len(record)
+            record_to_int = decoders.get(width)
+            if record_to_int is None:
+                masks = bit_masks(width, args.order)
+                record_to_int = make_record_to_int(masks, args.low, args.high)
+                decoders[width] = record_to_int
+
+            val = record_to_int(record)
+            write(u'{}\n'.format(val))
+    finally:
+        # Either may be the caller's sys.stdin/sys.stdout; don't close those
+        out.flush()
+        if args.input is not sys.stdin:
+            args.input.close()
 
 if __name__ == '__main__':
     main()
@@ -0,0 +1,116 @@
+from __future__ import unicode_literals
+import io
+import os
+import shutil
+import subprocess
+import sys
+import tempfile
+import unittest
+
+import csvadc
+
+HERE = os.path.dirname(os.path.abspath(__file__))
+SCRIPT = os.path.join(HERE, 'csvadc.py')
+EXAMPLE = os.path.join(HERE, 'example.csv')
+EXAMPLE_OUTPUT = ['0'] * 6 + ['None'] + ['15'] * 8 + ['10'] * 4 + ['5'] * 4
+
+
+class MainTest(unittest.TestCase):
+    def setUp(self):
+        self.tmpdir = tempfile.mkdtemp()
+
+    def tearDown(self):
+        shutil.rmtree(self.tmpdir)
+
+    def run_main(self, text, *args):
+        path = os.path.join(self.tmpdir, 'input.csv')
+        with io.open(path, 'w', newline='') as f:
+            f.write(text)
+
+        # A StringIO stdout has no fileno(); main() must still write to it
+        argv, stdout = sys.argv, sys.stdout
+        sys.argv = ['csvadc.py', path] + list(args)
+        sys.stdout = io.StringIO()
+        try:
+            csvadc.main()
+            return sys.stdout.getvalue().splitlines()
+        finally:
+            sys.argv, sys.stdout = argv, stdout
+
+    def run_script(self, args, input=b''):
+        p = subprocess.Popen([sys.executable, SCRIPT] + args,
+                stdin=subprocess.PIPE, stdout=subprocess.PIPE, stderr=subprocess.PIPE)
+        out, err = p.communicate(input)
+        return p.returncode, out.decode().splitlines(), err.decode()
+
+    def test_example(self):
+        with io.open(EXAMPLE, newline='') as f:
+            text = f.read()
+        self.assertEqual(self.run_main(text), EXAMPLE_OUTPUT)
+
+    def test_example_piped(self):
+        # A real stdout pipe takes the buffered fd-reopen path
+        rc, out, err = self.run_script([EXAMPLE])
+        self.assertEqual((rc, err), (0, ''))
+        self.assertEqual(out, EXAMPLE_OUTPUT)
+
+    def test_stdin(self):
+        with open(EXAMPLE, 'rb') as f:
+            rc, out, err = self.run_script(['-'], f.read())
+        self.assertEqual((rc, err), (0, ''))
+        self.assertEqual(out, EXAMPLE_OUTPUT)
+
+    def test_missing_input(self):
+        path = os.path.join(self.tmpdir, 'missing.csv')
+        rc, out, err = self.run_script([path])
+        self.assertEqual((rc, out), (2, []))
+        self.assertIn('usage:', err)
+        self.assertIn("can't open '{}'".format(path), err)
+
+    def test_msb_first(self):
+        self.assertEqual(self.run_main('a,b,c\n2,0,0\n', '--order', 'msb'), ['4'])
+
+    def test_long_row_uses_record_width(self):
+        self.assertEqual(self.run_main('a,b\n2,0,2\n'), ['5'])
+
+    def test_short_row_uses_record_width(self):
+        self.assertEqual(self.run_main('a,b,c\n2,2\n', '--order', 'msb'), ['3'])
+
+    def test_blank_line(self):
+        self.assertEqual(self.run_main('a,b,c\n2,0,2\n\n'), ['5', '0'])
+
+    def test_short_row(self):
+        self.assertEqual(self.run_main('a,b,c\n2,2\n'), ['3'])
+
+    def test_nan_is_indeterminate(self):
+        self.assertEqual(self.run_main('a,b,c\nnan,2,0\n'), ['None'])
+
+    def test_trailing_comma_on_data_rows(self):
+        self.assertEqual(self.run_main('a,b\n2,0,\n0,2,\n'), ['1', '2'])
+
+    def test_trailing_comma_on_all_rows(self):
+        self.assertEqual(self.run_main('a,b,\n2,0,\n0,2,\n'), ['1', '2'])
+
+    def test_trailing_comma_on_header_only(self):
+        self.assertEqual(self.run_main('a,b,\n2,0\n0,2\n'), ['1', '2'])
+
+    def test_unnamed_column_is_kept(self):
+        self.assertEqual(self.run_main('a,,c\n2,2,0\n'), ['3'])
+
+    def test_trailing_comma_after_blank_line(self):
+        self.assertEqual(self.run_main('a,b\n\n2,0,\n'), ['0', '1'])
+
+    def test_trailing_comma_on_first_row_only(self):
+        self.assertEqual(self.run_main('a,b,c\n2,0,\n0,2,2\n'), ['1', '6'])
+
+    def test_trailing_comma_on_later_row_only(self):
+        self.assertEqual(self.run_main('a,b,c\n2,0,2\n0,2,\n'), ['5', '2'])
+
+    def test_empty_middle_cell_is_an_error(self):
+        # Must not be dropped from later rows that fill it in
+        with self.assertRaises(ValueError):
+            self.run_main('a,b,c\n2,,2\n0,2,2\n')
+
+
+if __name__ == '__main__':
+    unittest.main()